@@ -1,5 +1,10 @@
 import gspread
 import json
+from compact_mapping import compact_filename, write_compact_mapping
+
+OUTPUT_FILE = 'Matter_PICS__TC_Mapping_V_40_1_5.json'
+WRITE_COMPACT_MAPPING = True  # Also write the dictionary-encoded compact file next to the JSON
+COMPACT_COMPRESSION = "gzip"  # "gzip", "zstd" or None
 
 # Authenticate with your service account
 gc = gspread.service_account(filename='credentials.json')
@@ -68,7 +73,17 @@ def generate_json(data_1, data_2):
 # Generate JSON and write to file
 json_data = generate_json(data_1, data_2)
 
-with open('Matter_PICS__TC_Mapping_V_40_1_5.json', 'w') as f:
+with open(OUTPUT_FILE, 'w') as f:
     json.dump(json_data, f, indent=4)
 
 print("✅ JSON file generated successfully.")
+
+if WRITE_COMPACT_MAPPING:
+    try:
+        compact_file = compact_filename(OUTPUT_FILE, COMPACT_COMPRESSION)
+        write_compact_mapping(json_data, compact_file, COMPACT_COMPRESSION)
+    except ImportError:
+        print("⚠️ zstandard is not installed. Writing the compact mapping with gzip instead.")
+        compact_file = compact_filename(OUTPUT_FILE, "gzip")
+        write_compact_mapping(json_data, compact_file, "gzip")
+    print(f"✅ Compact mapping file generated: {compact_file}")
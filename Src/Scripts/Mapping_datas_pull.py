@@ -1,7 +1,7 @@
 import re
 import json
 import datetime
-from bs4 import BeautifulSoup
+from html_parser import parse_html
 import gspread
 from google.oauth2.service_account import Credentials
 from gspread_formatting import CellFormat, Color, format_cell_range, TextFormat
@@ -20,42 +20,41 @@ def extract_test_cases_and_pics(html_files, fallback_pics_dict):
     special_clusters = ['Device Discovery Test Plan']  # Add more clusters as needed
 
     for html_file in html_files:
-        with open(html_file, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'lxml')
+        doc = parse_html(html_file)
 
         results = []
         current_cluster = ""
         special_pics_cache = dict(extract_steps_pics_for_cluster(html_file, None))
 
-        for tag in soup.find_all(['h1', 'h4']):
+        for tag in doc.find_all(['h1', 'h4']):
             if tag.name == 'h1':
                 strong = tag.find('strong')
-                new_cluster = strong.get_text(strip=True) if strong else tag.get_text(strip=True)
+                new_cluster = strong.text(strip=True) if strong else tag.text(strip=True)
                 new_cluster = re.sub(r'\s*(Test\s*Plan|Tests?)\s*$', '', new_cluster, flags=re.IGNORECASE).strip()
                 if new_cluster != current_cluster:
                     current_cluster = new_cluster
                     #print(f"🔄 New cluster: {current_cluster}")
 
             if tag.name == 'h4':
-                tag_id = tag.get('id', '')
+                tag_id = tag.get('id')
                 if any(tag_id.startswith(prefix) for prefix in ['_features', '_attributes', '_manual_controllable',
                                                                 '_commands_received', '_commands_generated',
                                                                 '_events']):
                     continue
 
-                text = tag.get_text(strip=True)
+                text = tag.text(strip=True)
                 match = re.search(r'\[TC-([^\]]+)\]\s*(.+)', text)
                 if match:
                     tc_id = f'TC-{match.group(1)}'
                     tc_desc = match.group(2)
 
                     # High-Level PICS
-                    h5 = tag.find_next(lambda tag: tag.name == "h5" and tag.get("id", "").startswith("_pics"))
+                    h5 = tag.find_next("h5", id_prefix="_pics")
                     high_pics = []
                     if h5:
                         ulist = h5.find_next("div", class_="ulist")
                         if ulist:
-                            lines = ulist.get_text(separator="\n").splitlines()
+                            lines = ulist.text(separator="\n").splitlines()
                             pics_flat = []
                             for line in lines:
                                 line = re.sub(r'\([^)]*\)', '', line).strip()
@@ -72,21 +71,20 @@ def extract_test_cases_and_pics(html_files, fallback_pics_dict):
                             steps_pics = special_pics_cache.get(current_cluster, "").split(", ")
                         else:
                             # Use the original steps pics extraction logic for these clusters if the flag is False
-                            h5_proc = tag.find_next(
-                                lambda tag: tag.name == "h5" and tag.get("id", "").startswith("_test_procedure"))
+                            h5_proc = tag.find_next("h5", id_prefix="_test_procedure")
                             if h5_proc:
                                 table = h5_proc.find_next("table")
                                 if table:
                                     rows = table.find_all("tr")
                                     if rows:
-                                        headers = [th.get_text(strip=True).upper() for th in
+                                        headers = [th.text(strip=True).upper() for th in
                                                    rows[0].find_all(["td", "th"])]
                                         pics_idx = next((i for i, h in enumerate(headers) if "PICS" in h), -1)
                                         if pics_idx != -1:
                                             for row in rows[1:]:
                                                 cells = row.find_all(["td", "th"])
                                                 if len(cells) > pics_idx:
-                                                    cell_text = cells[pics_idx].get_text(separator="\n").strip()
+                                                    cell_text = cells[pics_idx].text(separator="\n").strip()
                                                     matches = re.findall(r'(!?[A-Z0-9]+\.[\w\-\.]+)', cell_text)
                                                     steps_pics.extend(matches)
 
@@ -95,7 +93,7 @@ def extract_test_cases_and_pics(html_files, fallback_pics_dict):
                                     sib = h5_proc.find_next_sibling()
                                     while sib:
                                         if sib.name == "p":
-                                            matches = re.findall(r'(!?[A-Z0-9]+\.[\w\-\.]+)', sib.get_text())
+                                            matches = re.findall(r'(!?[A-Z0-9]+\.[\w\-\.]+)', sib.text())
                                             steps_pics.extend(matches)
                                         if sib.name in ["h1", "h2", "h3", "h4", "h5"]:
                                             break
@@ -103,20 +101,19 @@ def extract_test_cases_and_pics(html_files, fallback_pics_dict):
 
                     else:
                         # For other clusters, use the original logic without external function
-                        h5_proc = tag.find_next(
-                            lambda tag: tag.name == "h5" and tag.get("id", "").startswith("_test_procedure"))
+                        h5_proc = tag.find_next("h5", id_prefix="_test_procedure")
                         if h5_proc:
                             table = h5_proc.find_next("table")
                             if table:
                                 rows = table.find_all("tr")
                                 if rows:
-                                    headers = [th.get_text(strip=True).upper() for th in rows[0].find_all(["td", "th"])]
+                                    headers = [th.text(strip=True).upper() for th in rows[0].find_all(["td", "th"])]
                                     pics_idx = next((i for i, h in enumerate(headers) if "PICS" in h), -1)
                                     if pics_idx != -1:
                                         for row in rows[1:]:
                                             cells = row.find_all(["td", "th"])
                                             if len(cells) > pics_idx:
-                                                cell_text = cells[pics_idx].get_text(separator="\n").strip()
+                                                cell_text = cells[pics_idx].text(separator="\n").strip()
                                                 matches = re.findall(r'(!?[A-Z0-9]+\.[\w\-\.]+)', cell_text)
                                                 steps_pics.extend(matches)
 
@@ -125,7 +122,7 @@ def extract_test_cases_and_pics(html_files, fallback_pics_dict):
                                 sib = h5_proc.find_next_sibling()
                                 while sib:
                                     if sib.name == "p":
-                                        matches = re.findall(r'(!?[A-Z0-9]+\.[\w\-\.]+)', sib.get_text())
+                                        matches = re.findall(r'(!?[A-Z0-9]+\.[\w\-\.]+)', sib.text())
                                         steps_pics.extend(matches)
                                     if sib.name in ["h1", "h2", "h3", "h4", "h5"]:
                                         break
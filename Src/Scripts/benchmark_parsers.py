@@ -0,0 +1,80 @@
+import os
+import io
+import json
+import time
+import contextlib
+import html_parser
+from html_parser import parse_html, available_backends, file_fingerprint, BACKEND_CACHE_FILE
+from pics_xml_datas import extract_section_tables
+from Mapping_datas_pull import extract_test_cases_and_pics
+from extract_pics import extract_steps_pics_for_cluster
+
+# === SETTINGS ===
+HTML_FILES = ['allclusters.html', 'index.html']
+REFERENCE_BACKEND = "bs4"
+STEPS_PICS_CLUSTER = "Device Discovery Test Plan"
+ROUNDS = 3
+
+def extract_all(backend):
+    """Run every extractor with the given backend and return the extracted rows."""
+    html_parser.PARSER_BACKEND = backend
+    results = {}
+    # Extractors print progress per cluster; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for html_file in HTML_FILES:
+            results[f"sections:{html_file}"] = extract_section_tables(parse_html(html_file), html_file)
+            results[f"steps_pics:{html_file}"] = extract_steps_pics_for_cluster(html_file, STEPS_PICS_CLUSTER)
+        results["test_cases"] = extract_test_cases_and_pics(HTML_FILES, {})
+    return results
+
+def time_backend(backend):
+    best = None
+    results = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        results = extract_all(backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+def diff_results(reference, candidate):
+    mismatches = []
+    for key, expected in reference.items():
+        if candidate.get(key) != expected:
+            mismatches.append(key)
+    return mismatches
+
+def main():
+    backends = available_backends()
+    if REFERENCE_BACKEND not in backends:
+        print(f"❌ Reference backend '{REFERENCE_BACKEND}' is not installed.")
+        return 1
+
+    original_backend = html_parser.PARSER_BACKEND
+    timings = {}
+    reference_time, reference = time_backend(REFERENCE_BACKEND)
+    timings[REFERENCE_BACKEND] = reference_time
+    print(f"⏱️ {REFERENCE_BACKEND}: {reference_time:.2f}s (reference)")
+
+    for backend in backends:
+        if backend == REFERENCE_BACKEND:
+            continue
+        elapsed, results = time_backend(backend)
+        mismatches = diff_results(reference, results)
+        if mismatches:
+            print(f"❌ {backend}: {elapsed:.2f}s, extracted rows differ from {REFERENCE_BACKEND} in: {', '.join(mismatches)}")
+            continue
+        timings[backend] = elapsed
+        print(f"✅ {backend}: {elapsed:.2f}s, identical extracted rows")
+
+    html_parser.PARSER_BACKEND = original_backend
+    fastest = min(timings, key=timings.get)
+    with open(BACKEND_CACHE_FILE, 'w') as f:
+        # select_backend falls back to bs4 once any of these files changes
+        inputs = {os.path.abspath(html_file): file_fingerprint(html_file) for html_file in HTML_FILES}
+        json.dump({"backend": fastest, "timings": timings, "inputs": inputs}, f, indent=4)
+    print(f"✅ Selected parser backend: {fastest} (saved to {BACKEND_CACHE_FILE})")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
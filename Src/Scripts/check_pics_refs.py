@@ -0,0 +1,81 @@
+import re
+import json
+from collections import defaultdict
+from Mapping_datas_pull import extract_test_cases_and_pics
+from pics_xml_datas import load_section_data, SECTIONS
+
+# === SETTINGS ===
+HTML_FILES = ['allclusters.html', 'index.html']
+ENABLE_FALLBACK_PICS = True
+FALLBACK_PICS_FILE = "fallback_pics.json"
+
+PICS_CODE_PATTERN = re.compile(r'!?[A-Z0-9]+\.[\w\-\.]+')
+
+def build_defined_pics_set(section_data):
+    """Collect every Variable/PICS code defined in the section tables into one set."""
+    defined = set()
+    for section in SECTIONS:
+        for row in section_data[section]['rows']:
+            pics_code = row[1].strip()
+            if pics_code:
+                defined.add(pics_code)
+    return defined
+
+def normalize_pics_code(code):
+    # '!' only negates the reference; the code itself must still be defined
+    return code.lstrip('!').rstrip('.')
+
+def find_dangling_references(test_cases, defined_pics, fallback_pics_dict=None):
+    """Check every referenced PICS code against the defined set in a single pass.
+
+    Returns {cluster_name: [(tc_id, pics_code), ...]} for references with no definition.
+    """
+    dangling = defaultdict(dict)
+    tc_cluster = {}
+
+    for cluster_name, tc_id, _, high_pics, steps_pics in test_cases:
+        tc_cluster[tc_id] = cluster_name
+        for code in PICS_CODE_PATTERN.findall(f"{high_pics}, {steps_pics}"):
+            code = normalize_pics_code(code)
+            if code not in defined_pics:
+                dangling[cluster_name][(tc_id, code)] = None
+
+    # Fallback PICS are also checked for test cases that no longer exist in the spec
+    for tc_id, codes in (fallback_pics_dict or {}).items():
+        cluster_name = tc_cluster.get(tc_id, "Unknown cluster")
+        for code in codes:
+            code = normalize_pics_code(code.strip())
+            if code not in defined_pics:
+                dangling[cluster_name][(tc_id, code)] = None
+
+    return {cluster_name: list(refs) for cluster_name, refs in dangling.items()}
+
+def print_dangling_report(dangling):
+    if not dangling:
+        print("✅ All referenced PICS codes are defined.")
+        return
+
+    total = sum(len(refs) for refs in dangling.values())
+    print(f"❌ {total} dangling PICS reference(s) in {len(dangling)} cluster(s)")
+    for cluster_name in sorted(dangling):
+        print(f"  {cluster_name}:")
+        for tc_id, code in dangling[cluster_name]:
+            print(f"    - {tc_id}: {code}")
+
+def main():
+    fallback_pics_dict = {}
+    if ENABLE_FALLBACK_PICS:
+        try:
+            with open(FALLBACK_PICS_FILE, 'r') as f:
+                fallback_pics_dict = json.load(f)
+        except FileNotFoundError:
+            print("⚠️ Fallback PICS file not found. Continuing without it.")
+
+    defined_pics = build_defined_pics_set(load_section_data(HTML_FILES))
+    test_cases = extract_test_cases_and_pics(HTML_FILES, fallback_pics_dict)
+    dangling = find_dangling_references(test_cases, defined_pics, fallback_pics_dict)
+    print_dangling_report(dangling)
+    return 1 if dangling else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+import gzip
+import json
+import os
+import sys
+import time
+import tempfile
+from collections.abc import Mapping
+
+# === SETTINGS ===
+MAPPING_JSON_FILE = 'Matter_PICS__TC_Mapping_V_40_1_5.json'
+COMPACT_COMPRESSION = "gzip"  # "gzip", "zstd" (needs the zstandard package) or None
+COMPACT_FORMAT_VERSION = 1
+
+_EXTENSIONS = {None: ".compact.json", "gzip": ".compact.json.gz", "zstd": ".compact.json.zst"}
+
+# Entry layout: [tcDescription, cluster, CertificationStatus, PICS, stepsPICS(, notes)]
+# Strings are indexes into the string table; a negated PICS "!X" is stored as -(index of X) - 1.
+# `cert` is derived from CertificationStatus and empty notes are dropped.
+
+
+def compact_filename(json_file, compression=COMPACT_COMPRESSION):
+    return os.path.splitext(json_file)[0] + _EXTENSIONS[compression]
+
+
+def _compress(data, compression):
+    if compression is None:
+        return data
+    if compression == "gzip":
+        return gzip.compress(data)
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor().compress(data)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def _decompress(data, filename):
+    if filename.endswith(".gz"):
+        return gzip.decompress(data)
+    if filename.endswith(".zst"):
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def encode_mapping(json_data):
+    strings = []
+    index = {}
+
+    def ref(value):
+        if value not in index:
+            index[value] = len(strings)
+            strings.append(value)
+        return index[value]
+
+    def pics_ref(pics):
+        return -ref(pics[1:]) - 1 if pics.startswith('!') else ref(pics)
+
+    entries = {}
+    for tc_id, entry in json_data.items():
+        packed = [
+            entry["tcDescription"],
+            ref(entry["clusterName"]),
+            ref(entry["CertificationStatus"]),
+            [pics_ref(p) for p in entry["PICS"]],
+            [pics_ref(p) for p in entry["stepsPICS"]],
+        ]
+        if entry.get("notes"):
+            packed.append(entry["notes"])
+        entries[tc_id] = packed
+
+    return {"version": COMPACT_FORMAT_VERSION, "strings": strings, "entries": entries}
+
+
+def write_compact_mapping(json_data, filename, compression=COMPACT_COMPRESSION):
+    data = json.dumps(encode_mapping(json_data), separators=(',', ':')).encode('utf-8')
+    # Compress first so a missing codec does not leave an empty file behind
+    data = _compress(data, compression)
+    with open(filename, 'wb') as f:
+        f.write(data)
+
+
+class CompactMapping(Mapping):
+    """Read-only view of a compact mapping file; entries are expanded to the full JSON form on access."""
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            payload = json.loads(_decompress(f.read(), filename))
+        if payload.get("version") != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact mapping version: {payload.get('version')}")
+        self._strings = payload["strings"]
+        self._entries = payload["entries"]
+
+    def _pics(self, refs):
+        strings = self._strings
+        return [strings[i] if i >= 0 else "!" + strings[-i - 1] for i in refs]
+
+    def __getitem__(self, tc_id):
+        packed = self._entries[tc_id]
+        status = self._strings[packed[2]]
+        return {
+            "PICS": self._pics(packed[3]),
+            "stepsPICS": self._pics(packed[4]),
+            "tcDescription": packed[0],
+            "clusterName": self._strings[packed[1]],
+            "notes": packed[5] if len(packed) > 5 else "",
+            "CertificationStatus": status,
+            "cert": "true" if status == "Executable" else "false"
+        }
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def load_compact_mapping(filename):
+    return CompactMapping(filename)
+
+
+def benchmark(json_file, rounds=5):
+    with open(json_file, 'r') as f:
+        json_data = json.load(f)
+
+    # Benchmark files go to a temp directory so the compact file next to json_file is left alone
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _benchmark(json_file, json_data, tmp_dir, rounds)
+
+
+def _benchmark(json_file, json_data, tmp_dir, rounds):
+    print(f"{'format':<24}{'size (KiB)':>12}{'load (ms)':>12}{'load + expand (ms)':>20}")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        with open(json_file, 'r') as f:
+            json.load(f)
+    load_ms = (time.perf_counter() - start) / rounds * 1000
+    print(f"{'json (indent=4)':<24}{os.path.getsize(json_file) / 1024:>12.1f}{load_ms:>12.1f}{load_ms:>20.1f}")
+
+    for compression in _EXTENSIONS:
+        try:
+            filename = compact_filename(os.path.join(tmp_dir, os.path.basename(json_file)), compression)
+            write_compact_mapping(json_data, filename, compression)
+        except ImportError:
+            print(f"⚠️ Skipping {compression}: zstandard is not installed.")
+            continue
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            mapping = load_compact_mapping(filename)
+        load_ms = (time.perf_counter() - start) / rounds * 1000
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            mapping = load_compact_mapping(filename)
+            expanded = {tc_id: mapping[tc_id] for tc_id in mapping}
+        expand_ms = (time.perf_counter() - start) / rounds * 1000
+
+        if expanded != json_data:
+            print(f"❌ {filename} does not round-trip to {json_file}")
+        label = f"compact ({compression or 'plain'})"
+        print(f"{label:<24}{os.path.getsize(filename) / 1024:>12.1f}{load_ms:>12.1f}{expand_ms:>20.1f}")
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else MAPPING_JSON_FILE)
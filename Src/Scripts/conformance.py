@@ -19,13 +19,13 @@ def setup_gspread(credentials_file, scope, spreadsheet_url):
     return client.open_by_key(spreadsheet_id)
 
 
-def create_sc_variable_set(sheet):
-    return {row['Variable'].strip() for row in sheet.get_all_records()}
+def create_sc_variable_set(records):
+    return {row['Variable'].strip() for row in records}
 
 
-def create_features_map(sheet):
+def create_features_map(records):
     features = {}
-    for row in sheet.get_all_records():
+    for row in records:
         pics_name = row.get("PICS name", "").strip()
         variable = row.get("Variable", "").strip()
         if pics_name and variable:
@@ -181,40 +181,47 @@ def process_row(mo_val, rules, sc_variables, features_map, features_data, variab
 
 # -------- Main Code --------
 
-# Load configuration and credentials
-rules = load_json("conformance_rules.json")
-scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-spreadsheet_url = "https://docs.google.com/spreadsheets/d/11VFIumfm5xpB8YhKtGi8esbJ8KlHrRJ-WbQj4I6deyA/edit#gid=0"
-spreadsheet = setup_gspread("credentials.json", scope, spreadsheet_url)
-
-# Load lookup maps
-sc_variables = create_sc_variable_set(spreadsheet.worksheet("Server/Client PICS"))
-features_sheet = spreadsheet.worksheet("Features")
-features_map = create_features_map(features_sheet)
-features_data = features_sheet.get_all_records()  # ✅ Cache once
+SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/11VFIumfm5xpB8YhKtGi8esbJ8KlHrRJ-WbQj4I6deyA/edit#gid=0"
+RULES_FILE = "conformance_rules.json"
 
 # Sheets to process
-sheets_to_process = [
+SHEETS_TO_PROCESS = [
     "Server/Client PICS", "Attributes", "Manual Controllable",
     "Commands Received", "Commands Generated", "Events", "PIXIT Definition"
 ]
 
-# Process each sheet
-for sheet_name in sheets_to_process:
-    sheet = spreadsheet.worksheet(sheet_name)
-    data = sheet.get_all_records()
-    num_rows = len(data)
-    sheet.batch_clear([f"G2:G{num_rows + 1}"])
-
-    conformance_values = []
-    for row in data:
-        mo_val = row.get(rules["column_mapping"]["mandatory_optional_column"], "")
-        variable_context = row.get("Variable", "")
-        conformance_values.append(
-            process_row(mo_val, rules, sc_variables, features_map, features_data, variable_context)
-        )
-
-    cell_range = rowcol_to_a1(2, 7) + f":{rowcol_to_a1(1 + num_rows, 7)}"
-    sheet.update(range_name= cell_range, values= conformance_values)
-
-print("✅ Column G (Conformance) updated with bracketed feature mapping support.")
+
+def main():
+    # Load configuration and credentials
+    rules = load_json(RULES_FILE)
+    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+    spreadsheet = setup_gspread("credentials.json", scope, SPREADSHEET_URL)
+
+    # Load lookup maps
+    sc_variables = create_sc_variable_set(spreadsheet.worksheet("Server/Client PICS").get_all_records())
+    features_data = spreadsheet.worksheet("Features").get_all_records()  # ✅ Cache once
+    features_map = create_features_map(features_data)
+
+    # Process each sheet
+    for sheet_name in SHEETS_TO_PROCESS:
+        sheet = spreadsheet.worksheet(sheet_name)
+        data = sheet.get_all_records()
+        num_rows = len(data)
+        sheet.batch_clear([f"G2:G{num_rows + 1}"])
+
+        conformance_values = []
+        for row in data:
+            mo_val = row.get(rules["column_mapping"]["mandatory_optional_column"], "")
+            variable_context = row.get("Variable", "")
+            conformance_values.append(
+                process_row(mo_val, rules, sc_variables, features_map, features_data, variable_context)
+            )
+
+        cell_range = rowcol_to_a1(2, 7) + f":{rowcol_to_a1(1 + num_rows, 7)}"
+        sheet.update(range_name= cell_range, values= conformance_values)
+
+    print("✅ Column G (Conformance) updated with bracketed feature mapping support.")
+
+
+if __name__ == '__main__':
+    main()
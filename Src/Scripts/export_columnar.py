@@ -0,0 +1,138 @@
+import os
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pics_xml_datas import load_section_data, SECTIONS
+from conformance import (load_json, create_sc_variable_set, create_features_map, process_row,
+                         RULES_FILE, SHEETS_TO_PROCESS)
+
+# === SETTINGS ===
+HTML_FILES = ['allclusters.html', 'index.html']
+MAPPING_JSON_FILE = 'Matter_PICS__TC_Mapping_V_40_1_5.json'
+EXPORT_DIR = "./columnar_output"
+# Parquet for column-pruned scans, uncompressed Arrow IPC for zero-copy memory mapping
+EXPORT_FORMATS = ["parquet", "arrow"]
+
+
+def pics_prefix(pics_code):
+    # Same grouping as the `cond` attribute in the XML output, e.g. OCC.S.A0000 -> OCC.S
+    return '.'.join(pics_code.split('.')[:2])
+
+
+def dict_column(values):
+    return pa.array(values, type=pa.string()).dictionary_encode()
+
+
+def pics_record(header, row):
+    # The first four columns are fixed; spec tables may repeat a name such as "Variable" after them,
+    # so only the trailing columns are looked up by header name
+    record = dict(zip(header[4:], row[4:]))
+    record.update({"Cluster Name": row[0], "Variable": row[1], "PICS name": row[2], "Reference": row[3]})
+    return record
+
+
+def build_pics_table(section_data, rules):
+    records = {
+        section: [pics_record(data['header'], row) for row in data['rows']]
+        for section, data in section_data.items()
+    }
+    sc_variables = create_sc_variable_set(records['Server/Client PICS'])
+    features_data = records['Features']
+    features_map = create_features_map(features_data)
+    mo_column = rules["column_mapping"]["mandatory_optional_column"]
+
+    columns = {name: [] for name in ["section", "cluster", "prefix", "variable", "pics_name",
+                                     "reference", "description", "conformance_raw", "conformance"]}
+    for section in SECTIONS:
+        for row, record in zip(section_data[section]['rows'], records[section]):
+            variable = row[1]
+            mo_val = str(record.get(mo_column, ""))
+            conformance = None
+            if section in SHEETS_TO_PROCESS:
+                conformance = process_row(mo_val, rules, sc_variables, features_map, features_data, variable)[0]
+
+            columns["section"].append(section)
+            columns["cluster"].append(row[0])
+            columns["prefix"].append(pics_prefix(variable))
+            columns["variable"].append(variable)
+            columns["pics_name"].append(row[2])
+            columns["reference"].append(row[3])
+            columns["description"].append(record.get("Description", ""))
+            columns["conformance_raw"].append(mo_val)
+            columns["conformance"].append(conformance)
+
+    return pa.table({
+        name: dict_column(values) if name in ("section", "cluster", "prefix") else pa.array(values, type=pa.string())
+        for name, values in columns.items()
+    })
+
+
+def build_test_case_tables(mapping):
+    test_cases = {"tc_id": [], "cluster": [], "description": [], "certification_status": []}
+    tc_pics = {"tc_id": [], "cluster": [], "kind": [], "pics": [], "prefix": [], "negated": []}
+
+    for tc_id, entry in mapping.items():
+        cluster = entry["clusterName"]
+        test_cases["tc_id"].append(tc_id)
+        test_cases["cluster"].append(cluster)
+        test_cases["description"].append(entry["tcDescription"])
+        test_cases["certification_status"].append(entry["CertificationStatus"])
+
+        # One row per referenced PICS so usage counts are a plain group-by
+        for kind in ("PICS", "stepsPICS"):
+            for pics in entry[kind]:
+                code = pics.lstrip('!')
+                tc_pics["tc_id"].append(tc_id)
+                tc_pics["cluster"].append(cluster)
+                tc_pics["kind"].append(kind)
+                tc_pics["pics"].append(code)
+                tc_pics["prefix"].append(pics_prefix(code))
+                tc_pics["negated"].append(pics.startswith('!'))
+
+    test_cases_table = pa.table({
+        "tc_id": pa.array(test_cases["tc_id"], type=pa.string()),
+        "cluster": dict_column(test_cases["cluster"]),
+        "description": pa.array(test_cases["description"], type=pa.string()),
+        "certification_status": dict_column(test_cases["certification_status"]),
+    })
+    tc_pics_table = pa.table({
+        "tc_id": dict_column(tc_pics["tc_id"]),
+        "cluster": dict_column(tc_pics["cluster"]),
+        "kind": dict_column(tc_pics["kind"]),
+        "pics": pa.array(tc_pics["pics"], type=pa.string()),
+        "prefix": dict_column(tc_pics["prefix"]),
+        "negated": pa.array(tc_pics["negated"], type=pa.bool_()),
+    })
+    return test_cases_table, tc_pics_table
+
+
+def write_table(table, name, export_dir=EXPORT_DIR, formats=EXPORT_FORMATS):
+    os.makedirs(export_dir, exist_ok=True)
+    for fmt in formats:
+        filename = os.path.join(export_dir, f"{name}.{fmt}")
+        if fmt == "parquet":
+            pq.write_table(table, filename)
+        elif fmt == "arrow":
+            with pa.OSFile(filename, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+        print(f"✅ Wrote {table.num_rows} rows to {filename}")
+
+
+def main():
+    rules = load_json(RULES_FILE)
+    write_table(build_pics_table(load_section_data(HTML_FILES), rules), "pics")
+
+    try:
+        mapping = load_json(MAPPING_JSON_FILE)
+    except FileNotFoundError:
+        print(f"⚠️ {MAPPING_JSON_FILE} not found. Skipping test case export.")
+        return
+
+    test_cases_table, tc_pics_table = build_test_case_tables(mapping)
+    write_table(test_cases_table, "test_cases")
+    write_table(tc_pics_table, "test_case_pics")
+
+
+if __name__ == '__main__':
+    main()
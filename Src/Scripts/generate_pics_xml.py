@@ -1,8 +1,11 @@
 import os
 import re
+import sys
+import json
 import gspread
 from lxml import etree as ET
 from collections import defaultdict
+from validate_pics_xml import validate_xml_files, print_validation_summary
 
 # === MANUAL INPUT ===
 VERSION = "V_39_1_4_1_finalization"
@@ -10,10 +13,12 @@ GENERATED_DATE = "2025-03-13 15:30:41"
 REF_DOCUMENT = "version 1.4.1-Release a855cb78,\nDraft\n2025-03-12 15:00:19 +0530"
 GOOGLE_SHEET_URL = "https://docs.google.com/spreadsheets/d/11VFIumfm5xpB8YhKtGi8esbJ8KlHrRJ-WbQj4I6deyA/edit#gid=0"
 XML_OUTPUT_DIR = "./xml_output"
-
-# === GOOGLE SHEET SETUP ===
-gc = gspread.service_account(filename='credentials.json')
-sh = gc.open_by_url(GOOGLE_SHEET_URL)
+ENABLE_XSD_VALIDATION = True
+XSD_SCHEMA_FILE = "Generic-PICS-XML-Schema.xsd"
+USE_LOCAL_SNAPSHOT = False  # Reuse the last downloaded rows instead of reading the Google Sheet
+SNAPSHOT_FILE = "pics_snapshot.jsonl"
+SNAPSHOT_INDEX_FILE = "pics_snapshot_index.json"
+CLUSTER_FILTER = []  # Cluster names to generate; empty generates all. Names passed on the command line win.
 
 # === SHEET TABS TO PROCESS ===
 sheet_tabs = [
@@ -27,25 +32,82 @@ sheet_tabs = [
     "PIXIT Definition"
 ]
 
+# === SERVER SIDE SECTIONS: TAB -> (XML TAG, COMMENT) ===
+section_map = {
+    "Attributes": ("attributes", "Attributes PICS write"),
+    "Events": ("events", "Events PICS write"),
+    "Commands Generated": ("commandsGenerated", "Commands generated PICS write"),
+    "Commands Received": ("commandsReceived", "Commands received PICS write"),
+    "Features": ("features", "Features PICS write"),
+    "Manual Controllable": ("manually", "Manual controllable PICS write")
+}
+
+def pics_cond(item_number):
+    return '.'.join(item_number.split('.')[:2]) if '.' in item_number else item_number
+
 # === HELPER: ORGANIZE DATA BY CLUSTER ===
-cluster_data = defaultdict(lambda: defaultdict(list))
-
-for tab in sheet_tabs:
-    worksheet = sh.worksheet(tab)
-    rows = worksheet.get_all_records()
-    for row in rows:
-        cluster = row.get("Cluster Name", "").strip()
-        if not cluster:
-            continue
-
-        item = {
-            "itemNumber": row.get("Variable", ""),
-            "feature": row.get("Description", ""),
-            "reference": row.get("Reference", ""),
-            "status": row.get("Conformance", ""),
-            "support": "false"
-        }
-        cluster_data[cluster][tab].append(item)
+def download_cluster_data(sh):
+    cluster_data = defaultdict(lambda: defaultdict(list))
+
+    for tab in sheet_tabs:
+        worksheet = sh.worksheet(tab)
+        rows = worksheet.get_all_records()
+        for row in rows:
+            cluster = row.get("Cluster Name", "").strip()
+            if not cluster:
+                continue
+
+            item = {
+                "itemNumber": row.get("Variable", ""),
+                "feature": row.get("Description", ""),
+                "reference": row.get("Reference", ""),
+                "status": row.get("Conformance", ""),
+                "support": "false",
+                "cond": pics_cond(row.get("Variable", ""))
+            }
+            cluster_data[cluster][tab].append(item)
+
+    return cluster_data
+
+# === HELPER: LOCAL SNAPSHOT WITH CLUSTER -> TAB -> ROW RANGE INDEX ===
+def write_snapshot(cluster_data, snapshot_file=SNAPSHOT_FILE, index_file=SNAPSHOT_INDEX_FILE):
+    # One item per line, grouped by tab then cluster, so every cluster/tab pair is one
+    # contiguous byte range that can be read with a single seek
+    index = {cluster: {} for cluster in cluster_data}
+    with open(snapshot_file, "wb") as f:
+        for tab in sheet_tabs:
+            for cluster, data in cluster_data.items():
+                items = data.get(tab)
+                if not items:
+                    continue
+                index[cluster][tab] = [f.tell(), len(items)]
+                for item in items:
+                    f.write(json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    with open(index_file, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    print(f"✅ Saved snapshot of {len(index)} clusters to: {snapshot_file}")
+
+def filter_clusters(data_by_cluster, clusters):
+    if not clusters:
+        return data_by_cluster
+    for cluster in clusters:
+        if cluster not in data_by_cluster:
+            print(f"⚠️ Cluster not found: {cluster}")
+    return {cluster: data_by_cluster[cluster] for cluster in clusters if cluster in data_by_cluster}
+
+def load_snapshot(clusters=None, snapshot_file=SNAPSHOT_FILE, index_file=SNAPSHOT_INDEX_FILE):
+    with open(index_file, "r", encoding="utf-8") as f:
+        index = filter_clusters(json.load(f), clusters)
+
+    cluster_data = {}
+    with open(snapshot_file, "rb") as f:
+        for cluster, tabs in index.items():
+            cluster_data[cluster] = {}
+            for tab, (offset, count) in tabs.items():
+                f.seek(offset)
+                cluster_data[cluster][tab] = [json.loads(f.readline()) for _ in range(count)]
+    return cluster_data
 
 # === XML GENERATION FUNCTION ===
 def create_pics_xml(cluster_name, data):
@@ -88,8 +150,7 @@ def create_pics_xml(cluster_name, data):
             pixit_item = ET.SubElement(pixit, "pixitItem")
             for tag in ["itemNumber", "feature", "reference"]:
                 ET.SubElement(pixit_item, tag).text = item[tag]
-            cond_value = '.'.join(item["itemNumber"].split('.')[:2]) if '.' in item["itemNumber"] else item["itemNumber"]
-            ET.SubElement(pixit_item, "status", cond=cond_value).text = item["status"]
+            ET.SubElement(pixit_item, "status", cond=item["cond"]).text = item["status"]
             ET.SubElement(pixit_item, "support").text = "0x00"  # override for PIXIT section
     else:
         ET.SubElement(root, "pixit")
@@ -98,15 +159,6 @@ def create_pics_xml(cluster_name, data):
     root.append(ET.Comment("Server side PICS"))
     server = ET.SubElement(root, "clusterSide", type="Server")
 
-    section_map = {
-        "Attributes": ("attributes", "Attributes PICS write"),
-        "Events": ("events", "Events PICS write"),
-        "Commands Generated": ("commandsGenerated", "Commands generated PICS write"),
-        "Commands Received": ("commandsReceived", "Commands received PICS write"),
-        "Features": ("features", "Features PICS write"),
-        "Manual Controllable": ("manually", "Manual controllable PICS write")
-    }
-
     for tab_name, (xml_tag, comment) in section_map.items():
         server.append(ET.Comment(comment))
         section = ET.SubElement(server, xml_tag)
@@ -115,8 +167,7 @@ def create_pics_xml(cluster_name, data):
                 pics_item = ET.SubElement(section, "picsItem")
                 for t in ["itemNumber", "feature", "reference"]:
                     ET.SubElement(pics_item, t).text = item[t]
-                cond_value = '.'.join(item["itemNumber"].split('.')[:2]) if '.' in item["itemNumber"] else item["itemNumber"]
-                ET.SubElement(pics_item, "status", cond=cond_value).text = item["status"]
+                ET.SubElement(pics_item, "status", cond=item["cond"]).text = item["status"]
                 ET.SubElement(pics_item, "support").text = item["support"]
 
     # Client side
@@ -164,9 +215,41 @@ XML PICS -Ref Document:
         final_xml = '\n'.join(tabbed_lines).encode("utf-8")
         f.write(final_xml)
 
-# === RUN FOR EACH CLUSTER ===
-os.makedirs(XML_OUTPUT_DIR, exist_ok=True)
-for cluster_name, data in cluster_data.items():
-    create_pics_xml(cluster_name, data)
+    return filename
+
+def main():
+    cluster_filter = sys.argv[1:] or CLUSTER_FILTER
 
-print("✅ All XML files generated in:", XML_OUTPUT_DIR)
+    if USE_LOCAL_SNAPSHOT and os.path.exists(SNAPSHOT_INDEX_FILE) and os.path.exists(SNAPSHOT_FILE):
+        cluster_data = load_snapshot(cluster_filter)
+    else:
+        # === GOOGLE SHEET SETUP ===
+        gc = gspread.service_account(filename='credentials.json')
+        sh = gc.open_by_url(GOOGLE_SHEET_URL)
+        cluster_data = download_cluster_data(sh)
+        write_snapshot(cluster_data)
+        cluster_data = filter_clusters(cluster_data, cluster_filter)
+
+    # === RUN FOR EACH CLUSTER ===
+    os.makedirs(XML_OUTPUT_DIR, exist_ok=True)
+    generated_files = {}
+    for cluster_name, data in cluster_data.items():
+        generated_files[create_pics_xml(cluster_name, data)] = cluster_name
+
+    print("✅ All XML files generated in:", XML_OUTPUT_DIR)
+
+    # === VALIDATE AGAINST XSD ===
+    if not ENABLE_XSD_VALIDATION:
+        print("ℹ️ XSD validation disabled.")
+    elif not os.path.exists(XSD_SCHEMA_FILE):
+        print(f"⚠️ Schema file {XSD_SCHEMA_FILE} not found. Skipping XSD validation.")
+    else:
+        # Report violations under the cluster names, not the sanitized file names
+        violations = validate_xml_files(list(generated_files), XSD_SCHEMA_FILE, cluster_names=generated_files)
+        print_validation_summary(violations, len(generated_files), XSD_SCHEMA_FILE)
+        if violations:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
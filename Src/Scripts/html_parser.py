@@ -0,0 +1,297 @@
+import os
+import json
+
+# === SETTINGS ===
+# "auto" uses the backend benchmark_parsers.py validated against bs4 and saved to
+# BACKEND_CACHE_FILE, and bs4 until that has run. Any other value forces that backend.
+PARSER_BACKEND = os.environ.get("PICS_PARSER_BACKEND", "auto")
+BACKEND_CACHE_FILE = "parser_backend.json"
+DEFAULT_BACKEND = "bs4"
+BACKEND_PREFERENCE = ["selectolax", "lxml", "bs4"]
+
+_ELEMENT_SKIP_PREFIXES = ('-', '_', '!')
+
+
+# -------- BeautifulSoup backend (reference implementation) --------
+
+class BsNode:
+    __slots__ = ("_tag",)
+
+    def __init__(self, tag):
+        self._tag = tag
+
+    @property
+    def name(self):
+        return self._tag.name
+
+    def get(self, attr, default=''):
+        value = self._tag.get(attr, default)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def __eq__(self, other):
+        # Structural comparison, as between BeautifulSoup Tags
+        return isinstance(other, BsNode) and self._tag == other._tag
+
+    def text(self, separator='', strip=False):
+        return self._tag.get_text(separator=separator, strip=strip)
+
+    def find(self, name):
+        tag = self._tag.find(name)
+        return BsNode(tag) if tag else None
+
+    def find_all(self, names):
+        return [BsNode(tag) for tag in self._tag.find_all(names)]
+
+    def find_next(self, name, id_prefix=None, class_=None):
+        def match(tag):
+            if tag.name != name:
+                return False
+            if id_prefix is not None and not tag.get("id", "").startswith(id_prefix):
+                return False
+            return class_ is None or class_ in tag.get("class", [])
+        tag = self._tag.find_next(match)
+        return BsNode(tag) if tag else None
+
+    def find_next_sibling(self):
+        tag = self._tag.find_next_sibling()
+        return BsNode(tag) if tag else None
+
+    def iter_next(self):
+        for tag in self._tag.find_all_next():
+            yield BsNode(tag)
+
+
+def _parse_bs4(html_file, features):
+    from bs4 import BeautifulSoup
+    with open(html_file, 'r', encoding='utf-8') as f:
+        return BsNode(BeautifulSoup(f, features))
+
+
+# -------- lxml.html backend with compiled XPath queries --------
+
+_xpath_cache = {}
+
+def _xpath(expr):
+    compiled = _xpath_cache.get(expr)
+    if compiled is None:
+        from lxml import etree
+        compiled = _xpath_cache[expr] = etree.XPath(expr)
+    return compiled
+
+
+class LxmlNode:
+    __slots__ = ("_el",)
+
+    def __init__(self, el):
+        self._el = el
+
+    @property
+    def name(self):
+        return self._el.tag
+
+    def get(self, attr, default=''):
+        return self._el.get(attr, default)
+
+    def __eq__(self, other):
+        # Structural comparison, as between BeautifulSoup Tags: same markup, tail text excluded
+        from lxml import etree
+        return isinstance(other, LxmlNode) and (
+            etree.tostring(self._el, with_tail=False) == etree.tostring(other._el, with_tail=False))
+
+    def text(self, separator='', strip=False):
+        strings = _xpath("descendant::text()")(self._el)
+        if strip:
+            strings = [s.strip() for s in strings if s.strip()]
+        return separator.join(strings)
+
+    def find(self, name):
+        found = _xpath(f"descendant::{name}[1]")(self._el)
+        return LxmlNode(found[0]) if found else None
+
+    def find_all(self, names):
+        if isinstance(names, str):
+            names = [names]
+        expr = "descendant::*[{}]".format(" or ".join(f"self::{n}" for n in names))
+        return [LxmlNode(el) for el in _xpath(expr)(self._el)]
+
+    def find_next(self, name, id_prefix=None, class_=None):
+        # Same search order as BeautifulSoup.find_next: own descendants first, then following nodes
+        predicates = ""
+        if id_prefix is not None:
+            predicates += "[starts-with(@id, $id_prefix)]"
+        if class_ is not None:
+            predicates += "[contains(concat(' ', normalize-space(@class), ' '), concat(' ', $class_, ' '))]"
+        # Two [1]-limited searches; a union would build the whole following node-set on every call
+        variables = {"id_prefix": id_prefix or "", "class_": class_ or ""}
+        for axis in ("descendant", "following"):
+            found = _xpath(f"{axis}::{name}{predicates}[1]")(self._el, **variables)
+            if found:
+                return LxmlNode(found[0])
+        return None
+
+    def find_next_sibling(self):
+        found = _xpath("following-sibling::*[1]")(self._el)
+        return LxmlNode(found[0]) if found else None
+
+    def iter_next(self):
+        for el in _xpath("descendant::* | following::*")(self._el):
+            yield LxmlNode(el)
+
+
+def _parse_lxml(html_file, features):
+    import lxml.html
+    with open(html_file, 'rb') as f:
+        data = f.read()
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    return LxmlNode(lxml.html.document_fromstring(data, parser=parser))
+
+
+# -------- selectolax (lexbor) backend --------
+
+def _iter_following(node):
+    # Depth-first document order starting after `node`, own descendants first
+    current = node
+    while True:
+        if current.child is not None:
+            current = current.child
+        else:
+            while current is not None and current.next is None:
+                current = current.parent
+            if current is None:
+                return
+            current = current.next
+        yield current
+
+
+def _is_element(node):
+    return not node.tag.startswith(_ELEMENT_SKIP_PREFIXES)
+
+
+class SelectolaxNode:
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def name(self):
+        return self._node.tag
+
+    def get(self, attr, default=''):
+        attributes = self._node.attributes
+        if attr not in attributes:
+            return default
+        return attributes[attr] or ''
+
+    def __eq__(self, other):
+        # Structural comparison, as between BeautifulSoup Tags
+        return isinstance(other, SelectolaxNode) and self._node.html == other._node.html
+
+    def text(self, separator='', strip=False):
+        # lexbor joins every descendant text node with the separator; split on a NUL
+        # separator to get the individual strings and apply BeautifulSoup's strip rules
+        strings = self._node.text(separator='\0').split('\0')
+        if strip:
+            strings = [s.strip() for s in strings if s.strip()]
+        return separator.join(strings)
+
+    def _css(self, selector):
+        # Unlike BeautifulSoup, lexbor's css() also matches the node itself
+        nodes = self._node.css(selector)
+        if nodes and nodes[0] == self._node:
+            nodes = nodes[1:]
+        return nodes
+
+    def find(self, name):
+        nodes = self._css(name)
+        return SelectolaxNode(nodes[0]) if nodes else None
+
+    def find_all(self, names):
+        if isinstance(names, str):
+            names = [names]
+        return [SelectolaxNode(n) for n in self._css(", ".join(names))]
+
+    def find_next(self, name, id_prefix=None, class_=None):
+        for node in _iter_following(self._node):
+            if node.tag != name:
+                continue
+            wrapped = SelectolaxNode(node)
+            if id_prefix is not None and not wrapped.get("id").startswith(id_prefix):
+                continue
+            if class_ is not None and class_ not in wrapped.get("class").split():
+                continue
+            return wrapped
+        return None
+
+    def find_next_sibling(self):
+        node = self._node.next
+        while node is not None and not _is_element(node):
+            node = node.next
+        return SelectolaxNode(node) if node is not None else None
+
+    def iter_next(self):
+        for node in _iter_following(self._node):
+            if _is_element(node):
+                yield SelectolaxNode(node)
+
+
+def _parse_selectolax(html_file, features):
+    from selectolax.lexbor import LexborHTMLParser
+    with open(html_file, 'rb') as f:
+        return SelectolaxNode(LexborHTMLParser(f.read()).root)
+
+
+# -------- Backend selection --------
+
+BACKENDS = {
+    "bs4": ("bs4", _parse_bs4),
+    "lxml": ("lxml.html", _parse_lxml),
+    "selectolax": ("selectolax.lexbor", _parse_selectolax),
+}
+
+def available_backends():
+    available = []
+    for name in BACKEND_PREFERENCE:
+        module_name, _ = BACKENDS[name]
+        try:
+            __import__(module_name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def select_backend(html_file=None):
+    if PARSER_BACKEND != "auto":
+        return PARSER_BACKEND
+
+    # Only switch away from bs4 once the benchmark has proven identical extracted rows
+    try:
+        with open(BACKEND_CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return DEFAULT_BACKEND
+
+    # ...and only for the spec files it ran on, as long as they have not changed since
+    inputs = cached.get("inputs") or {}
+    if html_file is not None and os.path.abspath(html_file) not in inputs:
+        return DEFAULT_BACKEND
+    for path, fingerprint in inputs.items():
+        try:
+            if file_fingerprint(path) != fingerprint:
+                return DEFAULT_BACKEND
+        except OSError:
+            return DEFAULT_BACKEND
+    backend = cached.get("backend")
+    return backend if inputs and backend in available_backends() else DEFAULT_BACKEND
+
+def parse_html(html_file, backend=None, features='lxml'):
+    """Parse an HTML file into a node exposing the small query interface used by the extractors.
+
+    `features` is only used by the bs4 backend and names the BeautifulSoup tree builder.
+    """
+    _, parse = BACKENDS[backend or select_backend(html_file)]
+    return parse(html_file, features)
@@ -1,5 +1,7 @@
 import re
-from bs4 import BeautifulSoup
+import asyncio
+from html_parser import parse_html
+from sheet_pipeline import run_pipeline, LocalSheetBackend
 import gspread
 from google.oauth2.service_account import Credentials
 from gspread_formatting import CellFormat, Color, format_cell_range, TextFormat
@@ -8,6 +10,8 @@ from gspread_formatting import CellFormat, Color, format_cell_range, TextFormat
 HTML_FILES = ['allclusters.html', 'index.html']
 CREDS_FILE = 'credentials.json'
 SHEET_URL = 'https://docs.google.com/spreadsheets/d/11VFIumfm5xpB8YhKtGi8esbJ8KlHrRJ-WbQj4I6deyA/edit#gid=0'
+PIPELINED_UPLOAD = True  # Upload each cluster's section rows while the rest of the spec is parsed
+UPLOAD_BACKEND = "google"  # "google" or "local" (CSV stand-in with simulated latency)
 
 SECTIONS = {
     'Server/Client PICS': ('h3', '_role'),
@@ -20,20 +24,25 @@ SECTIONS = {
     'PIXIT Definition': ('h2', '_pixit_definition')
 }
 
-def extract_section_tables(soup, html_file):
+def iter_cluster_sections(doc, html_file):
+    """Yield the section tables of one cluster at a time, as soon as the next <h1> is reached."""
     data_by_section = {key: {'header': [], 'rows': []} for key in SECTIONS}
     cluster_name = None
 
     ref_doc = html_file
 
-    for tag in soup.find_all(['h1', 'h2', 'h3', 'h4']):
+    for tag in doc.find_all(['h1', 'h2', 'h3', 'h4']):
         if tag.name == 'h1':
+            if any(data['header'] for data in data_by_section.values()):
+                yield data_by_section
+                data_by_section = {key: {'header': [], 'rows': []} for key in SECTIONS}
+
             strong = tag.find('strong')
             if strong:
-                cluster_name = strong.get_text(strip=True)
+                cluster_name = strong.text(strip=True)
 
         for section_name, (tag_type, id_prefix) in SECTIONS.items():
-            if tag.name == tag_type and tag.get('id', '').startswith(id_prefix):
+            if tag.name == tag_type and tag.get('id').startswith(id_prefix):
                 table = tag.find_next('table')
                 if not table:
                     continue
@@ -42,12 +51,12 @@ def extract_section_tables(soup, html_file):
                 if len(rows) < 2:
                     continue
 
-                section_heading_text = tag.get_text(strip=True)
+                section_heading_text = tag.text(strip=True)
 
                 header_cells = rows[0].find_all(['th', 'td'])[:3]
-                header = ["Cluster Name", header_cells[0].get_text(strip=True), "PICS name", "Reference"]
+                header = ["Cluster Name", header_cells[0].text(strip=True), "PICS name", "Reference"]
                 if len(header_cells) > 1:
-                    header += [cell.get_text(strip=True) for cell in header_cells[1:] if cell != header_cells[0]]
+                    header += [cell.text(strip=True) for cell in header_cells[1:] if cell != header_cells[0]]
                 data_by_section[section_name]['header'] = header
 
                 reference = f"{section_heading_text} - {ref_doc}"
@@ -58,15 +67,25 @@ def extract_section_tables(soup, html_file):
                         continue
 
                     # Extract main PICS and PICS name from first column
-                    pics_cell = cells[0].get_text(strip=True)
+                    pics_cell = cells[0].text(strip=True)
                     pics_main = re.sub(r'\(.*?\)', '', pics_cell).strip()
                     pics_name_match = re.search(r'\((.*?)\)', pics_cell)
                     pics_name = pics_name_match.group(1).strip() if pics_name_match else ''
 
-                    remaining_values = [cell.get_text(strip=True) for cell in cells[1:]]
+                    remaining_values = [cell.text(strip=True) for cell in cells[1:]]
                     row_data = [cluster_name, pics_main, pics_name, reference] + remaining_values
                     data_by_section[section_name]['rows'].append(row_data)
 
+    if any(data['header'] for data in data_by_section.values()):
+        yield data_by_section
+
+def extract_section_tables(doc, html_file):
+    data_by_section = {key: {'header': [], 'rows': []} for key in SECTIONS}
+    for cluster_sections in iter_cluster_sections(doc, html_file):
+        for section_name, data in cluster_sections.items():
+            if data['header']:
+                data_by_section[section_name]['header'] = data['header']
+            data_by_section[section_name]['rows'].extend(data['rows'])
     return data_by_section
 
 def clean_pics_name(pics_name):
@@ -94,18 +113,46 @@ def update_google_sheet(spreadsheet, section_name, data):
         horizontalAlignment='CENTER'
     ))
 
-def main():
+class GoogleSheetBackend:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def write_rows(self, section_name, header, rows, start_row):
+        if start_row == 2:
+            update_google_sheet(self.spreadsheet, section_name, {'header': header, 'rows': rows})
+            return
+        # Later batches land after the rows already written; append_rows grows the grid as needed
+        self.spreadsheet.worksheet(section_name).append_rows(rows)
+
+def extract_file_sections(html_file):
+    yield from iter_cluster_sections(parse_html(html_file), html_file)
+
+def main_pipelined():
+    if UPLOAD_BACKEND == "local":
+        backend = LocalSheetBackend()
+    else:
+        backend = GoogleSheetBackend(connect_to_google_sheet(SHEET_URL, CREDS_FILE))
+
+    totals = asyncio.run(run_pipeline(HTML_FILES, extract_file_sections, backend))
+    for section_name, total in totals.items():
+        print(f"✅ Total: {total} rows uploaded to sheet: {section_name}")
+
+def load_section_data(html_files):
     all_data = {section: {'header': [], 'rows': []} for section in SECTIONS}
 
-    for html_file in HTML_FILES:
-        with open(html_file, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f, 'lxml')
-            section_data = extract_section_tables(soup, html_file)
+    for html_file in html_files:
+        doc = parse_html(html_file)
+        section_data = extract_section_tables(doc, html_file)
 
-            for section in SECTIONS:
-                if section_data[section]['rows']:
-                    all_data[section]['header'] = section_data[section]['header']
-                    all_data[section]['rows'].extend(section_data[section]['rows'])
+        for section in SECTIONS:
+            if section_data[section]['rows']:
+                all_data[section]['header'] = section_data[section]['header']
+                all_data[section]['rows'].extend(section_data[section]['rows'])
+
+    return all_data
+
+def main():
+    all_data = load_section_data(HTML_FILES)
 
     spreadsheet = connect_to_google_sheet(SHEET_URL, CREDS_FILE)
 
@@ -115,4 +162,7 @@ def main():
             print(f"✅ Uploaded {len(data['rows'])} rows to sheet: {section_name}")
 
 if __name__ == '__main__':
-    main()
+    if PIPELINED_UPLOAD:
+        main_pipelined()
+    else:
+        main()
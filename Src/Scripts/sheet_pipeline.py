@@ -0,0 +1,106 @@
+import os
+import csv
+import time
+import asyncio
+
+# === SETTINGS ===
+UPLOAD_WORKERS = 4
+QUEUE_MAXSIZE = 8
+MIN_BATCH_ROWS = 100  # Per-cluster batches of a section are merged up to this size to limit API calls
+LOCAL_OUTPUT_DIR = "./sheet_output"
+LOCAL_LATENCY = 0.5  # seconds per write, roughly one Sheets API round trip
+
+
+class LocalSheetBackend:
+    """Stand-in for the Google Sheet that writes one CSV per section and sleeps to simulate latency."""
+
+    def __init__(self, output_dir=LOCAL_OUTPUT_DIR, latency=LOCAL_LATENCY):
+        self.output_dir = output_dir
+        self.latency = latency
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _path(self, section_name):
+        safe_name = section_name.replace('/', '_')
+        return os.path.join(self.output_dir, f"{safe_name}.csv")
+
+    def write_rows(self, section_name, header, rows, start_row):
+        time.sleep(self.latency)
+        # Row 2 is the first data row, so the tab is reset and the header written with it
+        mode = 'w' if start_row == 2 else 'a'
+        with open(self._path(section_name), mode, newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if start_row == 2:
+                writer.writerow(header)
+            writer.writerows(rows)
+
+
+async def _produce(html_files, extract_batches, queue, workers, min_batch_rows):
+    next_row = {}
+    pending = {}
+
+    async def flush(section_name):
+        header, rows = pending.pop(section_name)
+        start_row = next_row.get(section_name, 2)
+        next_row[section_name] = start_row + len(rows)
+        # Blocks while the queue is full, so parsing never runs far ahead of uploads
+        await queue.put((section_name, header, rows, start_row))
+
+    for html_file in html_files:
+        # extract_batches may parse the whole file before returning its iterator, so build it off the loop too
+        batches = await asyncio.to_thread(lambda: iter(extract_batches(html_file)))
+        while True:
+            # Parsing is CPU bound; run each step off the event loop so uploads keep going
+            section_data = await asyncio.to_thread(next, batches, None)
+            if section_data is None:
+                break
+            for section_name, data in section_data.items():
+                if not data['rows']:
+                    continue
+                header, rows = pending.setdefault(section_name, (data['header'], []))
+                rows.extend(data['rows'])
+                if len(rows) >= min_batch_rows:
+                    await flush(section_name)
+
+    for section_name in list(pending):
+        await flush(section_name)
+
+    # One stop marker per consumer once every batch is queued
+    for _ in range(workers):
+        await queue.put(None)
+    return {section_name: row - 2 for section_name, row in next_row.items()}
+
+
+async def _consume(backend, queue, section_locks):
+    while True:
+        batch = await queue.get()
+        if batch is None:
+            queue.task_done()
+            return
+        section_name, header, rows, start_row = batch
+        # Batches of one section are written in the order they were queued; the lock is FIFO
+        async with section_locks.setdefault(section_name, asyncio.Lock()):
+            await asyncio.to_thread(backend.write_rows, section_name, header, rows, start_row)
+        queue.task_done()
+
+
+async def run_pipeline(html_files, extract_batches, backend, workers=UPLOAD_WORKERS, maxsize=QUEUE_MAXSIZE,
+                       min_batch_rows=MIN_BATCH_ROWS):
+    """Extract section rows cluster by cluster and upload each batch while parsing continues.
+
+    `extract_batches(html_file)` returns an iterable (typically a generator) of
+    {section_name: {'header': [...], 'rows': [...]}} dicts, one per cluster, and
+    `backend.write_rows(section_name, header, rows, start_row)` stores one batch.
+    Returns the total number of rows written per section.
+    """
+    queue = asyncio.Queue(maxsize=maxsize)
+    section_locks = {}
+    tasks = [asyncio.create_task(_produce(html_files, extract_batches, queue, workers, min_batch_rows))]
+    tasks += [asyncio.create_task(_consume(backend, queue, section_locks)) for _ in range(workers)]
+
+    try:
+        # A failed upload or parse cancels the rest instead of leaving the producer blocked on a full queue
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return results[0]
@@ -0,0 +1,44 @@
+import os
+from html_parser import parse_html
+from pics_xml_datas import extract_section_tables
+from check_pics_refs import build_defined_pics_set, find_dangling_references
+
+SPEC_FILE = os.path.join(os.path.dirname(__file__), "fixtures", "spec_sample.html")
+
+
+def defined_pics():
+    return build_defined_pics_set(extract_section_tables(parse_html(SPEC_FILE), SPEC_FILE))
+
+
+def test_defined_set_covers_every_section():
+    assert defined_pics() == {"OO.S", "OO.C", "OO.S.F00", "OO.S.F01", "OO.S.A0000", "OO.S.A4000",
+                              "PIXIT.OO.TIMEOUT"}
+
+
+def test_negated_and_trailing_dot_codes_resolve():
+    test_cases = [("On/Off", "TC-OO-1.1", "", "OO.S, !OO.S.F01", "OO.S.A0000., !OO.S.A4000.")]
+
+    assert find_dangling_references(test_cases, defined_pics()) == {}
+
+
+def test_dangling_codes_are_grouped_by_cluster_and_reported_once():
+    test_cases = [
+        ("On/Off", "TC-OO-1.1", "", "OO.S, OO.S.F02", "OO.S.F02, !OO.S.F02, OO.S.A9999"),
+        ("On/Off", "TC-OO-2.1", "", "OO.S.F02", ""),
+        ("Level Control", "TC-LVL-2.1", "", "LVL.S", "!LVL.S.F00"),
+    ]
+
+    assert find_dangling_references(test_cases, defined_pics()) == {
+        "On/Off": [("TC-OO-1.1", "OO.S.F02"), ("TC-OO-1.1", "OO.S.A9999"), ("TC-OO-2.1", "OO.S.F02")],
+        "Level Control": [("TC-LVL-2.1", "LVL.S"), ("TC-LVL-2.1", "LVL.S.F00")],
+    }
+
+
+def test_fallback_codes_are_checked_even_without_a_test_case():
+    test_cases = [("On/Off", "TC-OO-1.1", "", "OO.S", "!OO.S.M.Fallback")]
+    fallback_pics = {"TC-OO-1.1": [" !OO.S.M.Fallback"], "TC-GONE-1.1": ["OO.S", "GONE.S."]}
+
+    assert find_dangling_references(test_cases, defined_pics(), fallback_pics) == {
+        "On/Off": [("TC-OO-1.1", "OO.S.M.Fallback")],
+        "Unknown cluster": [("TC-GONE-1.1", "GONE.S")],
+    }
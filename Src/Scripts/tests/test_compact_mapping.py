@@ -0,0 +1,63 @@
+import json
+import pytest
+from compact_mapping import encode_mapping, write_compact_mapping, load_compact_mapping, compact_filename
+
+MAPPING = {
+    "TC-OO-1.1": {
+        "PICS": ["OO.S", "!OO.S.F01", "!!OO.S.F02"],
+        "stepsPICS": ["OO.S.A0000", "!OO.S"],
+        "tcDescription": "Global Attributes with DUT as Server",
+        "clusterName": "On/Off",
+        "notes": "",
+        "CertificationStatus": "Executable",
+        "cert": "true"
+    },
+    "TC-OO-2.1": {
+        "PICS": ["OO.S"],
+        "stepsPICS": [],
+        "tcDescription": "Attributes with server as DUT",
+        "clusterName": "On/Off",
+        "notes": "Blocked on SDK issue",
+        "CertificationStatus": "Provisional",
+        "cert": "false"
+    },
+}
+
+
+def test_encoding_shares_strings_and_drops_empty_notes():
+    packed = encode_mapping(MAPPING)
+    strings = packed["strings"]
+
+    assert strings.count("OO.S") == 1
+    assert strings.count("On/Off") == 1
+    # A negated code is stored as -(index of the code) - 1; only the first '!' is folded
+    assert packed["entries"]["TC-OO-1.1"][3] == [
+        strings.index("OO.S"), -strings.index("OO.S.F01") - 1, -strings.index("!OO.S.F02") - 1]
+    assert len(packed["entries"]["TC-OO-1.1"]) == 5
+    assert packed["entries"]["TC-OO-2.1"][5] == "Blocked on SDK issue"
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_round_trip(tmp_path, compression):
+    filename = compact_filename(str(tmp_path / "mapping.json"), compression)
+    write_compact_mapping(MAPPING, filename, compression)
+
+    mapping = load_compact_mapping(filename)
+    assert len(mapping) == 2
+    assert dict(mapping) == MAPPING
+    assert mapping["TC-OO-1.1"]["PICS"] == ["OO.S", "!OO.S.F01", "!!OO.S.F02"]
+    assert mapping["TC-OO-2.1"]["cert"] == "false"
+    assert "TC-OO-1.1" in mapping
+    assert "TC-MISSING-1.1" not in mapping
+    assert mapping.get("TC-MISSING-1.1") is None
+
+
+def test_unsupported_version_is_rejected(tmp_path):
+    filename = str(tmp_path / "mapping.compact.json")
+    packed = encode_mapping(MAPPING)
+    packed["version"] += 1
+    with open(filename, 'w') as f:
+        json.dump(packed, f)
+
+    with pytest.raises(ValueError, match="Unsupported compact mapping version"):
+        load_compact_mapping(filename)
@@ -0,0 +1,56 @@
+import os
+import pyarrow as pa
+import pyarrow.parquet as pq
+from html_parser import parse_html
+from pics_xml_datas import extract_section_tables
+from export_columnar import build_pics_table, write_table
+
+SPEC_FILE = os.path.join(os.path.dirname(__file__), "fixtures", "spec_sample.html")
+RULES = {
+    "column_mapping": {"mandatory_optional_column": "Mandatory/Optional"},
+    "direct_values": ["M", "O"],
+    "server_client_prefix_handling": True,
+    "feature_mapping_handling": True,
+    "remove_suffix_in_brackets": True,
+}
+
+
+def pics_table():
+    return build_pics_table(extract_section_tables(parse_html(SPEC_FILE), SPEC_FILE), RULES)
+
+
+def rows_by_variable(table):
+    return {row["variable"]: row for row in table.to_pylist()}
+
+
+def test_pics_table_schema_and_dictionary_columns():
+    table = pics_table()
+
+    assert table.column_names == ["section", "cluster", "prefix", "variable", "pics_name",
+                                  "reference", "description", "conformance_raw", "conformance"]
+    for name in ("section", "cluster", "prefix"):
+        assert pa.types.is_dictionary(table.schema.field(name).type)
+    for name in ("variable", "description", "conformance"):
+        assert table.schema.field(name).type == pa.string()
+    assert table.num_rows == 7
+    assert table.column("prefix").combine_chunks().dictionary.to_pylist() == ["OO.S", "OO.C", "PIXIT.OO"]
+
+
+def test_duplicate_variable_header_does_not_shadow_the_pics_code():
+    # The fixture's Features header repeats "Variable" for the description column
+    rows = rows_by_variable(pics_table())
+
+    assert rows["OO.S.F00"]["section"] == "Features"
+    assert rows["OO.S.F00"]["conformance"] is None
+    assert rows["OO.S.A4000"]["conformance_raw"] == "[LT]"
+    assert rows["OO.S.A4000"]["conformance"] == "[OO.S.F00]"
+    assert rows["OO.S.A0000"]["description"] == "Does the device implement theOnOffattribute?"
+
+
+def test_written_files_round_trip(tmp_path):
+    table = pics_table()
+    write_table(table, "pics", export_dir=str(tmp_path))
+
+    assert pq.read_table(tmp_path / "pics.parquet").equals(table)
+    with pa.memory_map(str(tmp_path / "pics.arrow")) as source:
+        assert pa.ipc.open_file(source).read_all().equals(table)
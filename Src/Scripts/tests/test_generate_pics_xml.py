@@ -0,0 +1,73 @@
+import json
+from generate_pics_xml import download_cluster_data, write_snapshot, load_snapshot
+
+SHEET_ROWS = {
+    "Features": [
+        {"Cluster Name": "On/Off", "Variable": "OO.S.F00", "Description": "Lighting", "Reference": "1.5.4",
+         "Conformance": "O"},
+        {"Cluster Name": "Température Measurement", "Variable": "TMP.S.F00", "Description": "Tolérance",
+         "Reference": "2.3.4", "Conformance": "O"},
+    ],
+    "Attributes": [
+        {"Cluster Name": "On/Off", "Variable": "OO.S.A0000", "Description": "OnOff", "Reference": "1.5.6",
+         "Conformance": "M"},
+        {"Cluster Name": "On/Off", "Variable": "OO.S.A4000", "Description": "GlobalSceneControl",
+         "Reference": "1.5.6", "Conformance": "LT"},
+        {"Cluster Name": "", "Variable": "IGNORED", "Description": "", "Reference": "", "Conformance": ""},
+        {"Cluster Name": "Température Measurement", "Variable": "TMP.S.A0000", "Description": "Valeur °C",
+         "Reference": "2.3.5", "Conformance": "M"},
+    ],
+}
+
+
+class FakeSheet:
+    def worksheet(self, tab):
+        return FakeWorksheet(SHEET_ROWS.get(tab, []))
+
+
+class FakeWorksheet:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_all_records(self):
+        return self.rows
+
+
+def snapshot(tmp_path):
+    snapshot_file, index_file = str(tmp_path / "pics_snapshot.jsonl"), str(tmp_path / "pics_snapshot_index.json")
+    cluster_data = download_cluster_data(FakeSheet())
+    write_snapshot(cluster_data, snapshot_file, index_file)
+    return cluster_data, snapshot_file, index_file
+
+
+def test_index_reads_only_the_requested_cluster(tmp_path):
+    cluster_data, snapshot_file, index_file = snapshot(tmp_path)
+    with open(index_file, encoding="utf-8") as f:
+        index = json.load(f)
+    # Rows are grouped by tab first, so On/Off's two tabs are separated by another cluster's rows
+    assert index["On/Off"]["Features"][0] < index["Température Measurement"]["Features"][0] < \
+        index["On/Off"]["Attributes"][0]
+
+    loaded = load_snapshot(["On/Off"], snapshot_file, index_file)
+
+    assert list(loaded) == ["On/Off"]
+    assert loaded["On/Off"] == cluster_data["On/Off"]
+    assert [item["cond"] for item in loaded["On/Off"]["Attributes"]] == ["OO.S", "OO.S"]
+
+
+def test_non_ascii_cluster_names_round_trip(tmp_path):
+    cluster_data, snapshot_file, index_file = snapshot(tmp_path)
+
+    loaded = load_snapshot(None, snapshot_file, index_file)
+
+    assert loaded == cluster_data
+    assert loaded["Température Measurement"]["Attributes"][0]["feature"] == "Valeur °C"
+
+
+def test_unknown_cluster_warns(tmp_path, capsys):
+    _, snapshot_file, index_file = snapshot(tmp_path)
+
+    loaded = load_snapshot(["Température Measurement", "Missing"], snapshot_file, index_file)
+
+    assert list(loaded) == ["Température Measurement"]
+    assert "⚠️ Cluster not found: Missing" in capsys.readouterr().out
@@ -0,0 +1,74 @@
+import os
+import json
+import shutil
+import pytest
+import html_parser
+from html_parser import parse_html, available_backends, select_backend, file_fingerprint
+from pics_xml_datas import extract_section_tables
+from Mapping_datas_pull import extract_test_cases_and_pics
+from extract_pics import extract_steps_pics_for_cluster
+
+SPEC_FILE = os.path.join(os.path.dirname(__file__), "fixtures", "spec_sample.html")
+FALLBACK_PICS = {"TC-OO-1.1": ["!OO.S.M.Fallback"]}
+
+CANDIDATE_BACKENDS = [backend for backend in available_backends() if backend != "bs4"]
+
+
+def extract_all(backend, monkeypatch):
+    monkeypatch.setattr(html_parser, "PARSER_BACKEND", backend)
+    return {
+        "sections": extract_section_tables(parse_html(SPEC_FILE), SPEC_FILE),
+        "test_cases": extract_test_cases_and_pics([SPEC_FILE], FALLBACK_PICS),
+        "steps_pics": extract_steps_pics_for_cluster(SPEC_FILE, "Device Discovery Test Plan"),
+    }
+
+
+@pytest.fixture
+def reference(monkeypatch):
+    return extract_all("bs4", monkeypatch)
+
+
+def test_fixture_covers_every_extraction_path(reference):
+    sections = reference["sections"]
+    assert sections["Features"]["header"] == [
+        "Cluster Name", "Variable", "PICS name", "Reference", "Variable", "Mandatory/Optional"]
+    assert sections["Features"]["rows"][0][:3] == ["On/OffClusterTest Plan", "OO.S.F00", "LT"]
+    assert sections["PIXIT Definition"]["rows"][0][1] == "PIXIT.OO.TIMEOUT"
+
+    test_cases = {tc_id: row for _, tc_id, *row in reference["test_cases"]}
+    # Whitespace-only text nodes in the ulist and <br>-split PICS cells
+    assert test_cases["TC-OO-1.1"][1] == "OO.S, OO.S.F00, !OO.S.F01"
+    assert test_cases["TC-OO-1.1"][2] == "OO.S.A0000, !OO.S.F01, OO.S.A4000, OO.S.C40.Rsp, !OO.S.M.Fallback"
+    # Paragraph fallback when the test procedure has no table
+    assert test_cases["TC-LVL-2.1"] == ["Attributes with server as DUT", "LVL.S", "LVL.S.A0000, !LVL.S.F00"]
+
+    assert reference["steps_pics"] == [
+        ["Device Discovery Test Plan", ""],
+        ["Device Discovery Test Plan", "(MCORE.DD.QR), !(MCORE.DD.NFC)"],
+        ["Device Discovery Test Plan", ""],
+    ]
+
+
+@pytest.mark.parametrize("backend", CANDIDATE_BACKENDS)
+def test_backend_matches_bs4(backend, reference, monkeypatch):
+    assert extract_all(backend, monkeypatch) == reference
+
+
+@pytest.mark.skipif(not CANDIDATE_BACKENDS, reason="no backend besides bs4 is installed")
+def test_cached_backend_is_dropped_when_the_spec_changes(tmp_path, monkeypatch):
+    spec_file = str(tmp_path / "spec.html")
+    shutil.copy(SPEC_FILE, spec_file)
+    cache_file = tmp_path / "parser_backend.json"
+    cache_file.write_text(json.dumps({"backend": CANDIDATE_BACKENDS[0],
+                                      "inputs": {os.path.abspath(spec_file): file_fingerprint(spec_file)}}))
+    monkeypatch.setattr(html_parser, "PARSER_BACKEND", "auto")
+    monkeypatch.setattr(html_parser, "BACKEND_CACHE_FILE", str(cache_file))
+
+    assert select_backend(spec_file) == CANDIDATE_BACKENDS[0]
+    # A spec file the benchmark never ran on
+    assert select_backend(SPEC_FILE) == "bs4"
+
+    with open(spec_file, "a") as f:
+        f.write("<!-- edited -->")
+    assert select_backend(spec_file) == "bs4"
+    assert select_backend() == "bs4"
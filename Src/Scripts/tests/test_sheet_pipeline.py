@@ -0,0 +1,147 @@
+import csv
+import asyncio
+import threading
+import pytest
+from sheet_pipeline import run_pipeline, LocalSheetBackend
+
+HEADER = ["Cluster Name", "Variable", "PICS name", "Reference"]
+
+
+def cluster_batch(cluster, section_rows):
+    return {section: {'header': HEADER, 'rows': [[cluster, code, "", "ref"] for code in codes]}
+            for section, codes in section_rows.items()}
+
+
+def fake_extractor(batches_by_file, on_batch=None):
+    def extract(html_file):
+        for i, batch in enumerate(batches_by_file[html_file]):
+            if on_batch is not None:
+                on_batch(i)
+            yield batch
+    return extract
+
+
+def read_csv(backend, section_name):
+    with open(backend._path(section_name), newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_batches_of_a_section_arrive_in_order_with_one_header(tmp_path):
+    batches_by_file = {
+        "a.html": [cluster_batch(f"A{i}", {"Features": [f"A{i}.S.F00"], "Attributes": [f"A{i}.S.A0000"]})
+                   for i in range(5)],
+        "b.html": [cluster_batch(f"B{i}", {"Features": [f"B{i}.S.F00"]}) for i in range(5)],
+    }
+    backend = LocalSheetBackend(str(tmp_path), latency=0.005)
+
+    totals = asyncio.run(run_pipeline(["a.html", "b.html"], fake_extractor(batches_by_file), backend,
+                                      workers=4, min_batch_rows=1))
+
+    assert totals == {"Features": 10, "Attributes": 5}
+    features = read_csv(backend, "Features")
+    assert features[0] == HEADER
+    assert HEADER not in features[1:]
+    assert [row[1] for row in features[1:]] == (
+        [f"A{i}.S.F00" for i in range(5)] + [f"B{i}.S.F00" for i in range(5)])
+    assert [row[1] for row in read_csv(backend, "Attributes")[1:]] == [f"A{i}.S.A0000" for i in range(5)]
+
+
+def test_producer_blocks_when_queue_is_full(tmp_path):
+    # One batch in the consumer, two in the queue and one waiting on put
+    max_lead = 4
+    lead_reached = threading.Event()
+    produced, written, leads = [], [], []
+
+    class CountingBackend(LocalSheetBackend):
+        def write_rows(self, *args):
+            # Hold the first write until the producer is as far ahead as the queue allows
+            assert lead_reached.wait(5), "producer stopped before filling the queue"
+            super().write_rows(*args)
+            written.append(args[0])
+
+    def on_batch(i):
+        produced.append(i)
+        leads.append(len(produced) - len(written))
+        if len(produced) == max_lead:
+            lead_reached.set()
+
+    batches_by_file = {"a.html": [cluster_batch(f"A{i}", {"Features": [f"A{i}.S.F00"]}) for i in range(20)]}
+    backend = CountingBackend(str(tmp_path), latency=0.001)
+    asyncio.run(run_pipeline(["a.html"], fake_extractor(batches_by_file, on_batch), backend,
+                             workers=1, maxsize=2, min_batch_rows=1))
+
+    assert max(leads) == max_lead
+    assert len(written) == 20
+    assert len(read_csv(backend, "Features")) == 21
+
+
+def test_extractor_exception_propagates(tmp_path):
+    def extract(html_file):
+        yield cluster_batch("A0", {"Features": ["A0.S.F00"]})
+        raise RuntimeError("broken spec")
+
+    backend = LocalSheetBackend(str(tmp_path), latency=0.001)
+    with pytest.raises(RuntimeError, match="broken spec"):
+        asyncio.run(run_pipeline(["a.html"], extract, backend, min_batch_rows=1))
+
+
+def test_uploads_continue_while_a_file_is_parsed(tmp_path):
+    all_written = threading.Event()
+    writes = []
+
+    class CountingBackend(LocalSheetBackend):
+        def write_rows(self, *args):
+            super().write_rows(*args)
+            writes.append(args[0])
+            if len(writes) == 3:
+                all_written.set()
+
+    def extract(html_file):
+        # Plain function that parses the whole file before returning, like extract_file_sections
+        if html_file == "b.html":
+            # Every queued batch of a.html needs the event loop to be dispatched to the backend
+            assert all_written.wait(5), "uploads stalled while b.html was parsed"
+            return iter([cluster_batch("B0", {"Features": ["B0.S.F00"]})])
+        return iter([cluster_batch(f"A{i}", {"Features": [f"A{i}.S.F00"]}) for i in range(3)])
+
+    backend = CountingBackend(str(tmp_path), latency=0.05)
+    totals = asyncio.run(run_pipeline(["a.html", "b.html"], extract, backend, workers=1, min_batch_rows=1))
+
+    assert totals == {"Features": 4}
+    assert [row[1] for row in read_csv(backend, "Features")[1:]] == ["A0.S.F00", "A1.S.F00", "A2.S.F00", "B0.S.F00"]
+
+
+def test_uploads_overlap_parsing_and_each_other(tmp_path):
+    next_cluster_parsed = threading.Event()
+    first_writes = threading.Barrier(2, timeout=5)
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    class OverlapBackend(LocalSheetBackend):
+        def write_rows(self, section_name, header, rows, start_row):
+            with lock:
+                active.append(section_name)
+                peak.append(len(active))
+            if start_row == 2:
+                # The first batches of both sections are written at the same time...
+                first_writes.wait()
+                # ...and only finish once the producer has moved on to the next cluster
+                assert next_cluster_parsed.wait(5), "parsing waited for the upload"
+            super().write_rows(section_name, header, rows, start_row)
+            with lock:
+                active.remove(section_name)
+
+    def on_batch(i):
+        if i == 1:
+            next_cluster_parsed.set()
+
+    sections = {"Features": ["F"], "Attributes": ["A"]}
+    batches_by_file = {"a.html": [cluster_batch(f"A{i}", sections) for i in range(10)]}
+    backend = OverlapBackend(str(tmp_path), latency=0)
+
+    totals = asyncio.run(run_pipeline(["a.html"], fake_extractor(batches_by_file, on_batch), backend,
+                                      workers=4, min_batch_rows=1))
+
+    assert totals == {"Features": 10, "Attributes": 10}
+    assert max(peak) >= 2
@@ -0,0 +1,61 @@
+import sys
+import pytest
+import validate_pics_xml
+import generate_pics_xml
+from validate_pics_xml import validate_xml_files
+from generate_pics_xml import write_snapshot
+
+# Cluster names may only contain letters and spaces, so "On/Off" fails and "Level Control" passes
+SCHEMA = """<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+<xs:element name="clusterPICS"><xs:complexType><xs:sequence>
+<xs:element name="name"><xs:simpleType><xs:restriction base="xs:string">
+<xs:pattern value="[A-Za-z ]+"/>
+</xs:restriction></xs:simpleType></xs:element>
+<xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>
+</xs:sequence></xs:complexType></xs:element></xs:schema>
+"""
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "schema.xsd"
+    path.write_text(SCHEMA)
+    return str(path)
+
+
+def write_xml(tmp_path, stem, cluster_name):
+    path = tmp_path / f"{stem}.xml"
+    path.write_text(f"<clusterPICS><name>{cluster_name}</name><pixit /></clusterPICS>")
+    return str(path)
+
+
+@pytest.mark.parametrize("min_files_per_worker", [16, 1], ids=["in-process", "pool"])
+def test_only_invalid_files_are_reported(tmp_path, schema_file, monkeypatch, min_files_per_worker):
+    monkeypatch.setattr(validate_pics_xml, "MIN_FILES_PER_WORKER", min_files_per_worker)
+    valid = write_xml(tmp_path, "Level Control", "Level Control")
+    invalid = write_xml(tmp_path, "On_Off", "On/Off")
+
+    violations = validate_xml_files([valid, invalid], schema_file, workers=2)
+
+    assert list(violations) == ["On_Off"]
+    assert len(violations["On_Off"]) == 1
+    assert "line 1:" in violations["On_Off"][0]
+
+    # Keys are file stems unless the caller maps files back to cluster names
+    violations = validate_xml_files([valid, invalid], schema_file, workers=2, cluster_names={invalid: "On/Off"})
+    assert list(violations) == ["On/Off"]
+
+
+def test_generate_returns_1_on_violations(tmp_path, schema_file, monkeypatch, capsys):
+    item = {"itemNumber": "OO.S.A0000", "feature": "OnOff", "reference": "1.5.6", "status": "M",
+            "support": "false", "cond": "OO.S"}
+    monkeypatch.chdir(tmp_path)
+    write_snapshot({"On/Off": {"Attributes": [item]}, "Level Control": {"Attributes": [item]}})
+    monkeypatch.setattr(sys, "argv", ["generate_pics_xml.py"])
+    monkeypatch.setattr(generate_pics_xml, "USE_LOCAL_SNAPSHOT", True)
+    monkeypatch.setattr(generate_pics_xml, "XSD_SCHEMA_FILE", schema_file)
+
+    assert generate_pics_xml.main() == 1
+    out = capsys.readouterr().out
+    assert "❌ 1 of 2 XML files failed validation" in out
+    assert "  On/Off: 1 violation(s)" in out
@@ -0,0 +1,82 @@
+import os
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree as ET
+
+# === SETTINGS ===
+XSD_SCHEMA_FILE = "Generic-PICS-XML-Schema.xsd"
+XML_OUTPUT_DIR = "./xml_output"
+VALIDATION_WORKERS = os.cpu_count() or 1
+MIN_FILES_PER_WORKER = 16  # Below this a worker costs more to start (and compile the XSD) than it saves
+
+# Compiled schema, built once per worker process by _init_worker
+_schema = None
+
+def load_schema(schema_file):
+    return ET.XMLSchema(ET.parse(schema_file))
+
+def _init_worker(schema_file):
+    global _schema
+    _schema = load_schema(schema_file)
+
+def validate_xml_file(filename):
+    try:
+        doc = ET.parse(filename)
+    except ET.XMLSyntaxError as e:
+        return filename, [f"line {e.lineno}: {e.msg}"]
+
+    if _schema.validate(doc):
+        return filename, []
+    return filename, [f"line {err.line}: {err.message}" for err in _schema.error_log]
+
+def validate_xml_files(filenames, schema_file=XSD_SCHEMA_FILE, workers=VALIDATION_WORKERS, cluster_names=None):
+    """Validate XML files against the XSD, in a worker pool when there are enough files.
+
+    Returns {cluster_name: [violations]} for every file that failed validation. Cluster names
+    come from `cluster_names` ({filename: cluster_name}) and default to the file stem, which is
+    the sanitized name generate_pics_xml gave the file.
+    """
+    if not filenames:
+        return {}
+
+    workers = max(1, min(workers, len(filenames) // MIN_FILES_PER_WORKER))
+    if workers == 1:
+        # Small runs: one compiled schema in this process, no pool start-up cost
+        _init_worker(schema_file)
+        results = map(validate_xml_file, filenames)
+        return _collect_violations(results, cluster_names)
+
+    # Small batches keep the pool busy without paying IPC cost per file
+    chunksize = max(1, len(filenames) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(schema_file,)) as pool:
+        results = pool.map(validate_xml_file, filenames, chunksize=chunksize)
+        return _collect_violations(results, cluster_names)
+
+def _collect_violations(results, cluster_names=None):
+    cluster_names = cluster_names or {}
+    violations = {}
+    for filename, errors in results:
+        if errors:
+            cluster_name = cluster_names.get(filename) or os.path.splitext(os.path.basename(filename))[0]
+            violations[cluster_name] = errors
+    return violations
+
+def print_validation_summary(violations, total, schema_file=XSD_SCHEMA_FILE):
+    if not violations:
+        print(f"✅ All {total} XML files are valid against {schema_file}")
+        return
+
+    print(f"❌ {len(violations)} of {total} XML files failed validation against {schema_file}")
+    for cluster_name, errors in sorted(violations.items()):
+        print(f"  {cluster_name}: {len(errors)} violation(s)")
+        for error in errors:
+            print(f"    - {error}")
+
+def main():
+    filenames = sorted(glob.glob(os.path.join(XML_OUTPUT_DIR, "*.xml")))
+    violations = validate_xml_files(filenames)
+    print_validation_summary(violations, len(filenames))
+    return 1 if violations else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())